@@ -1,27 +1,87 @@
 """Synology DSM API client."""
 
 import json
+import time
 import requests
 from typing import Any
-from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # orjson decodes large snapshot listings considerably faster when installed
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Maximum number of pooled keep-alive connections to the NAS; callers that
+# issue concurrent requests should not exceed this
+MAX_CONNECTIONS = 16
+
+# (connect, read) timeout in seconds for every request, so a stalled
+# connection cannot hold a pool slot indefinitely
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Extra snapshot fields requested from list_snapshot, pre-encoded once
+_SNAPSHOT_ADDITIONAL = json.dumps(["locked_app_keys", "is_worm_locked"])
+
+# Seconds a cached read-only API response stays valid
+CACHE_TTL = 30
+
+
+def _check_uuid_json(lun_uuid_json: str) -> str:
+    """Return a JSON-encoded LUN UUID unchanged, rejecting raw (unquoted) UUIDs."""
+    if not (lun_uuid_json.startswith('"') and lun_uuid_json.endswith('"')):
+        raise ValueError(f"LUN UUID must be JSON-encoded (quoted), got {lun_uuid_json!r}")
+    return lun_uuid_json
 
 
 class SynologyAPI:
     """Client for interacting with Synology DSM API."""
 
-    def __init__(self, host: str, port: int = 5001, use_ssl: bool = True, verify_ssl: bool = True):
+    def __init__(
+        self,
+        host: str,
+        port: int = 5001,
+        use_ssl: bool = True,
+        verify_ssl: bool = True,
+        cache: bool = True,
+    ):
         self.host = host
         self.port = port
         self.use_ssl = use_ssl
         self.verify_ssl = verify_ssl
         protocol = "https" if use_ssl else "http"
         self.base_url = f"{protocol}://{host}:{port}/webapi/"
+        self._auth_url = f"{self.base_url}auth.cgi"
+        self._entry_url = f"{self.base_url}entry.cgi"
         self.session = requests.Session()
+        # Keep a larger pool of persistent connections so repeated and
+        # concurrent calls reuse the same TCP/TLS session
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=MAX_CONNECTIONS,
+            # Only retry failures to connect: those requests never reached the NAS,
+            # so re-sending is safe even for restore_snapshot. Read errors and
+            # error statuses are never retried.
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=False,
+                other=False,
+                respect_retry_after_header=False,
+                backoff_factor=0.3,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+        self.session.verify = verify_ssl
         self.sid: str | None = None
+        # Short-lived cache of read-only list responses, keyed by request parameters
+        self._cache: dict[tuple, tuple[float, dict[str, Any]]] | None = {} if cache else None
 
     def login(self, username: str, password: str) -> None:
         """Authenticate with the Synology NAS."""
-        url = urljoin(self.base_url, "auth.cgi")
         params = {
             "api": "SYNO.API.Auth",
             "version": "6",
@@ -32,9 +92,9 @@ class SynologyAPI:
             "format": "sid"
         }
 
-        response = self.session.get(url, params=params, verify=self.verify_ssl)
+        response = self.session.get(self._auth_url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
 
         if not data.get("success"):
             error_code = data.get("error", {}).get("code", "unknown")
@@ -47,7 +107,6 @@ class SynologyAPI:
         if not self.sid:
             return
 
-        url = urljoin(self.base_url, "auth.cgi")
         params = {
             "api": "SYNO.API.Auth",
             "version": "6",
@@ -56,16 +115,21 @@ class SynologyAPI:
         }
 
         try:
-            self.session.get(url, params=params, verify=self.verify_ssl)
+            self.session.get(self._auth_url, params=params, timeout=REQUEST_TIMEOUT)
         finally:
             self.sid = None
+            self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """Discard all cached API responses."""
+        if self._cache is not None:
+            self._cache.clear()
 
     def _api_request(self, api: str, version: int, method: str, **kwargs: Any) -> dict[str, Any]:
         """Make an authenticated API request."""
         if not self.sid:
             raise Exception("Not logged in. Call login() first.")
 
-        url = urljoin(self.base_url, "entry.cgi")
         params = {
             "api": api,
             "version": version,
@@ -74,9 +138,16 @@ class SynologyAPI:
             **kwargs
         }
 
-        response = self.session.get(url, params=params, verify=self.verify_ssl)
+        # entry.cgi accepts form-encoded POST bodies, which avoids building long
+        # query strings; auth.cgi calls stay on GET. Reads and writes alike are
+        # only retried on connection failures (see the adapter in __init__).
+        response = self.session.post(self._entry_url, data=params, timeout=REQUEST_TIMEOUT)
+        return self._parse_response(response)
+
+    def _parse_response(self, response: requests.Response) -> dict[str, Any]:
+        """Check an entry.cgi response and return its data payload."""
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
 
         if not data.get("success"):
             error_code = data.get("error", {}).get("code", "unknown")
@@ -84,6 +155,50 @@ class SynologyAPI:
 
         return data.get("data", {})
 
+    def compound_request(self, calls: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Make several API calls in a single SYNO.Entry.Request round trip.
+
+        Args:
+            calls: List of dicts with 'api', 'version', 'method' and call parameters
+
+        Returns:
+            Raw per-call results ('success' plus 'data' or 'error'), in call order
+        """
+        if not self.sid:
+            raise Exception("Not logged in. Call login() first.")
+
+        params = {
+            "api": "SYNO.Entry.Request",
+            "version": 1,
+            "method": "request",
+            "stop_when_error": "false",
+            "compound": json.dumps(calls),
+            "_sid": self.sid,
+        }
+
+        response = self.session.post(self._entry_url, data=params, timeout=REQUEST_TIMEOUT)
+        results = self._parse_response(response).get("result", [])
+
+        if len(results) != len(calls):
+            raise Exception(f"Compound request returned {len(results)} results for {len(calls)} calls")
+
+        return results
+
+    def _cached_api_request(self, api: str, version: int, method: str, **kwargs: Any) -> dict[str, Any]:
+        """Make a read-only API request, reusing a recent identical response if available."""
+        if self._cache is None:
+            return self._api_request(api, version, method, **kwargs)
+
+        key = (api, version, method, tuple(sorted(kwargs.items())))
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < CACHE_TTL:
+            return cached[1]
+
+        result = self._api_request(api, version, method, **kwargs)
+        self._cache[key] = (time.monotonic(), result)
+        return result
+
     def get_iscsi_targets(self, include_connections: bool = False) -> list[dict[str, Any]]:
         """Get all iSCSI targets.
 
@@ -91,10 +206,14 @@ class SynologyAPI:
             include_connections: If True, include connected_sessions data
         """
         params = {}
+        request = self._cached_api_request
         if include_connections:
             params["additional"] = json.dumps(["connected_sessions"])
+            # Connection state backs the safety check, so it bypasses the response
+            # cache; only ISCSIManager.check_active_connections briefly reuses it
+            request = self._api_request
 
-        return self._api_request(
+        return request(
             api="SYNO.Core.ISCSI.Target",
             version=1,
             method="list",
@@ -103,30 +222,78 @@ class SynologyAPI:
 
     def get_iscsi_luns(self) -> list[dict[str, Any]]:
         """Get all iSCSI LUNs."""
-        return self._api_request(
+        return self._cached_api_request(
             api="SYNO.Core.ISCSI.LUN",
             version=1,
             method="list"
         ).get("luns", [])
 
-    def get_lun_snapshots(self, lun_uuid: str) -> list[dict[str, Any]]:
-        """Get snapshots for a given iSCSI LUN UUID."""
-        # Note: src_lun_uuid parameter requires JSON-encoded (quoted) UUID
-        return self._api_request(
+    def _lun_snapshot_params(self, lun_uuid_json: str) -> dict[str, Any]:
+        """Build the list_snapshot parameters for a JSON-encoded LUN UUID."""
+        return {
+            "src_lun_uuid": _check_uuid_json(lun_uuid_json),
+            "additional": _SNAPSHOT_ADDITIONAL,
+        }
+
+    def get_lun_snapshots(self, lun_uuid_json: str) -> list[dict[str, Any]]:
+        """Get snapshots for a given iSCSI LUN.
+
+        Args:
+            lun_uuid_json: JSON-encoded (quoted) LUN UUID, as in the 'uuid_json'
+                field returned by ISCSIManager.get_luns_with_uuids
+        """
+        return self._cached_api_request(
             api="SYNO.Core.ISCSI.LUN",
             version=1,
             method="list_snapshot",
-            src_lun_uuid=json.dumps(lun_uuid),
-            additional=json.dumps(["locked_app_keys", "is_worm_locked"])
+            **self._lun_snapshot_params(lun_uuid_json)
         ).get("snapshots", [])
 
-    def revert_lun_snapshot(self, lun_uuid: str, snapshot_uuid: str) -> None:
-        """Revert an iSCSI LUN to a specific snapshot."""
+    def get_lun_snapshots_batch(self, lun_uuids_json: list[str]) -> list[list[dict[str, Any]] | Exception]:
+        """
+        Get snapshots for several iSCSI LUNs in one compound request.
+
+        Args:
+            lun_uuids_json: JSON-encoded (quoted) LUN UUIDs
+
+        Returns:
+            Snapshot list for each UUID, in order, or an Exception for LUNs
+            whose individual call failed
+        """
+        calls = [
+            {
+                "api": "SYNO.Core.ISCSI.LUN",
+                "version": 1,
+                "method": "list_snapshot",
+                **self._lun_snapshot_params(lun_uuid_json)
+            }
+            for lun_uuid_json in lun_uuids_json
+        ]
+
+        snapshots = []
+        for result in self.compound_request(calls):
+            if result.get("success"):
+                snapshots.append(result.get("data", {}).get("snapshots", []))
+            else:
+                error_code = result.get("error", {}).get("code", "unknown")
+                snapshots.append(Exception(f"API request failed with error code: {error_code}"))
+
+        return snapshots
+
+    def revert_lun_snapshot(self, lun_uuid_json: str, snapshot_uuid: str) -> None:
+        """Revert an iSCSI LUN to a specific snapshot.
+
+        Args:
+            lun_uuid_json: JSON-encoded (quoted) LUN UUID
+            snapshot_uuid: Plain snapshot UUID
+        """
+        # LUN and snapshot state change after a revert
+        self.clear_cache()
         self._api_request(
             api="SYNO.Core.ISCSI.LUN",
             version=1,
             method="restore_snapshot",
-            src_lun_uuid=json.dumps(lun_uuid),
+            src_lun_uuid=_check_uuid_json(lun_uuid_json),
             snapshot_uuid=json.dumps(snapshot_uuid)
         )
 
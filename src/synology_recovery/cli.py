@@ -2,13 +2,15 @@
 
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt
 
-from .api import SynologyAPI
+from .api import MAX_CONNECTIONS, SynologyAPI
 from .config import SynologyConfig
 from .iscsi import ISCSIManager
 from .snapshot import SnapshotManager
@@ -16,6 +18,12 @@ from .snapshot import SnapshotManager
 
 console = Console()
 
+# Number of most recent snapshots shown and offered per LUN
+MAX_SNAPSHOTS_SHOWN = 7
+
+# Maximum number of LUN reversions sent to the NAS at once
+MAX_CONCURRENT_REVERTS = min(8, MAX_CONNECTIONS)
+
 
 def display_targets(targets):
     """Display iSCSI targets in a table."""
@@ -58,14 +66,30 @@ def display_luns(luns):
     console.print(table)
 
 
+def format_snapshot_time(snapshot):
+    """Format a snapshot's creation time, or 'N/A' if it is unknown."""
+    sort_time = snapshot.get("sort_time")
+    if not sort_time:
+        return "N/A"
+    return datetime.fromtimestamp(sort_time).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def snapshot_row(snapshot):
+    """Return the (snapshot ID, created) display strings for a snapshot."""
+    # Handle different possible field names for snapshot ID
+    snapshot_id = snapshot.get("snapshot_uuid") or snapshot.get("uuid") or snapshot.get("snapshot_id") or "N/A"
+
+    return str(snapshot_id), format_snapshot_time(snapshot)
+
+
 def display_snapshots(snapshots, path):
     """Display snapshots for a path in a table."""
     if not snapshots:
         console.print(f"[yellow]No snapshots found for {path}[/yellow]")
         return
 
-    # Limit to 7 most recent snapshots
-    snapshots_to_show = snapshots[:7]
+    # Limit to the most recent snapshots
+    snapshots_to_show = snapshots[:MAX_SNAPSHOTS_SHOWN]
 
     table = Table(title=f"Volume Snapshots for {path} (showing {len(snapshots_to_show)} most recent)")
     table.add_column("#", style="cyan", width=4)
@@ -73,32 +97,35 @@ def display_snapshots(snapshots, path):
     table.add_column("Created", style="blue", width=20)
 
     for idx, snapshot in enumerate(snapshots_to_show, 1):
-        # Handle different possible field names for snapshot ID
-        snapshot_id = snapshot.get("snapshot_uuid") or snapshot.get("uuid") or snapshot.get("snapshot_id") or "N/A"
-
-        # Get created date with fallback
-        created = snapshot.get("datetime")
-        if created:
-            created_str = created.strftime("%Y-%m-%d %H:%M:%S")
-        else:
-            # Try to get raw timestamp and convert
-            time_created = snapshot.get("time_create") or snapshot.get("taken_time") or snapshot.get("create_time")
-            if time_created:
-                from datetime import datetime
-                created_str = datetime.fromtimestamp(int(time_created)).strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                created_str = "N/A"
+        table.add_row(str(idx), *snapshot_row(snapshot))
 
-        table.add_row(
-            str(idx),
-            str(snapshot_id),
-            created_str,
-        )
+    console.print(table)
+
+    if len(snapshots) > MAX_SNAPSHOTS_SHOWN:
+        console.print(f"[dim]({len(snapshots) - MAX_SNAPSHOTS_SHOWN} older snapshots not shown)[/dim]\n")
+
+
+def display_all_snapshots(all_snapshots):
+    """Display the most recent snapshots of every LUN in a single table."""
+    table = Table(title=f"Volume Snapshots (up to {MAX_SNAPSHOTS_SHOWN} most recent per LUN)")
+    table.add_column("LUN", style="magenta")
+    table.add_column("#", style="cyan", width=4)
+    table.add_column("Snapshot UUID", style="green")
+    table.add_column("Created", style="blue", width=20)
+
+    hidden = {}
+    for lun_name, lun_data in all_snapshots.items():
+        snapshots = lun_data["snapshots"]
+        for idx, snapshot in enumerate(snapshots[:MAX_SNAPSHOTS_SHOWN], 1):
+            table.add_row(lun_name if idx == 1 else "", str(idx), *snapshot_row(snapshot))
+        table.add_section()
+        if len(snapshots) > MAX_SNAPSHOTS_SHOWN:
+            hidden[lun_name] = len(snapshots) - MAX_SNAPSHOTS_SHOWN
 
     console.print(table)
 
-    if len(snapshots) > 7:
-        console.print(f"[dim]({len(snapshots) - 7} older snapshots not shown)[/dim]\n")
+    for lun_name, count in hidden.items():
+        console.print(f"[dim]({lun_name}: {count} older snapshots not shown)[/dim]")
 
 
 def display_connections(connections):
@@ -142,6 +169,63 @@ def select_snapshot(snapshots, path):
     return snapshots[choice - 1]
 
 
+def run_reversions(snapshot_mgr, reversion_plan):
+    """
+    Revert the planned LUNs concurrently, reporting each result as it arrives.
+
+    On Ctrl-C, reversions that have not started are cancelled, those already
+    running are waited for, and a summary is printed before re-raising.
+    """
+    def revert(item, snapshot_uuid):
+        console.print(
+            f"[cyan]Reverting {item['lun_name']} to snapshot {snapshot_uuid}...[/cyan]"
+        )
+        snapshot_mgr.revert_to_snapshot(item["lun_uuid_json"], snapshot_uuid)
+
+    def report(future, lun_name):
+        try:
+            future.result()
+            console.print(f"[green]✓ Successfully reverted {lun_name}[/green]")
+        except Exception as e:
+            console.print(f"[red]✗ Failed to revert {lun_name}: {e}[/red]")
+
+    # Reversions of different LUNs are independent, so issue them concurrently
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REVERTS)
+    futures = {}
+    reported = set()
+    try:
+        for item in reversion_plan:
+            snapshot = item["snapshot"]
+            snapshot_uuid = snapshot.get("snapshot_uuid", snapshot.get("uuid"))
+            futures[executor.submit(revert, item, snapshot_uuid)] = item["lun_name"]
+
+        for future in as_completed(futures):
+            report(future, futures[future])
+            reported.add(future)
+    except KeyboardInterrupt:
+        # Cancel everything still queued, then let in-flight reverts finish;
+        # an interrupted restore_snapshot call cannot be taken back
+        executor.shutdown(wait=False, cancel_futures=True)
+        running = [f for f in futures if not f.done()]
+        if running:
+            console.print(
+                f"\n[yellow]Interrupted - waiting for {len(running)} reversion(s) already in progress...[/yellow]"
+            )
+        executor.shutdown(wait=True)
+
+        for future, lun_name in futures.items():
+            if future not in reported and not future.cancelled():
+                report(future, lun_name)
+
+        submitted = {name for f, name in futures.items() if not f.cancelled()}
+        skipped = [item["lun_name"] for item in reversion_plan if item["lun_name"] not in submitted]
+        if skipped:
+            console.print(f"[yellow]Skipped (not started): {', '.join(skipped)}[/yellow]")
+        raise
+    finally:
+        executor.shutdown(wait=True)
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -191,15 +275,15 @@ def main():
             snapshot_mgr = SnapshotManager(api)
 
             console.print("[cyan]Retrieving iSCSI targets...[/cyan]")
-            targets = iscsi_mgr.get_all_targets()
+            targets = iscsi_mgr.get_all_targets(include_connections=True)
             display_targets(targets)
 
             console.print("\n[cyan]Retrieving iSCSI LUNs...[/cyan]")
-            luns = iscsi_mgr.get_all_luns()
-            display_luns(luns)
+            luns_raw = iscsi_mgr.get_all_luns()
+            display_luns(luns_raw)
 
             console.print("\n[cyan]Checking for active connections...[/cyan]")
-            has_connections, connections = iscsi_mgr.check_active_connections()
+            has_connections, connections = iscsi_mgr.check_active_connections(targets)
             display_connections(connections)
 
             # Only enforce safety check if not in list mode or dry-run mode
@@ -215,7 +299,7 @@ def main():
             elif has_connections and args.dry_run:
                 console.print("\n[yellow]⚠ Active connections detected, but proceeding in dry-run mode[/yellow]\n")
 
-            luns = iscsi_mgr.get_luns_with_uuids()
+            luns = iscsi_mgr.get_luns_with_uuids(luns_raw)
 
             if not luns:
                 console.print("\n[yellow]No LUNs found to process.[/yellow]")
@@ -235,8 +319,7 @@ def main():
 
             if args.list:
                 console.print("\n[cyan]Listing mode - no changes will be made[/cyan]\n")
-                for lun_name, lun_data in all_snapshots.items():
-                    display_snapshots(lun_data["snapshots"], lun_name)
+                display_all_snapshots(all_snapshots)
                 sys.exit(0)
 
             if args.dry_run:
@@ -254,7 +337,7 @@ def main():
                 if selected:
                     reversion_plan.append({
                         "lun_name": lun_name,
-                        "lun_uuid": lun_data["uuid"],
+                        "lun_uuid_json": lun_data["uuid_json"],
                         "snapshot": selected
                     })
 
@@ -269,9 +352,7 @@ def main():
             for item in reversion_plan:
                 lun_name = item["lun_name"]
                 snapshot = item["snapshot"]
-                created = snapshot.get("datetime", "N/A")
-                if created != "N/A":
-                    created = created.strftime("%Y-%m-%d %H:%M:%S")
+                created = format_snapshot_time(snapshot)
 
                 console.print(f"\n[cyan]LUN:[/cyan] {lun_name}")
                 console.print(
@@ -292,11 +373,7 @@ def main():
                 for item in reversion_plan:
                     lun_name = item["lun_name"]
                     snapshot = item["snapshot"]
-                    created = snapshot.get("datetime", "N/A")
-                    if created != "N/A":
-                        created_str = created.strftime("%Y-%m-%d %H:%M:%S")
-                    else:
-                        created_str = "N/A"
+                    created_str = format_snapshot_time(snapshot)
 
                     console.print(f"  • {lun_name}")
                     console.print(f"    → Snapshot from: [green]{created_str}[/green]")
@@ -321,21 +398,7 @@ def main():
 
                 console.print("\n[cyan]Starting reversion process...[/cyan]\n")
 
-                for item in reversion_plan:
-                    lun_name = item["lun_name"]
-                    lun_uuid = item["lun_uuid"]
-                    snapshot = item["snapshot"]
-                    snapshot_uuid = snapshot.get("snapshot_uuid", snapshot.get("uuid"))
-
-                    console.print(
-                        f"[cyan]Reverting {lun_name} to snapshot {snapshot_uuid}...[/cyan]"
-                    )
-
-                    try:
-                        snapshot_mgr.revert_to_snapshot(lun_uuid, snapshot_uuid)
-                        console.print(f"[green]✓ Successfully reverted {lun_name}[/green]")
-                    except Exception as e:
-                        console.print(f"[red]✗ Failed to revert {lun_name}: {e}[/red]")
+                run_reversions(snapshot_mgr, reversion_plan)
 
                 console.print("\n[green bold]✓ Reversion process complete![/green bold]")
 
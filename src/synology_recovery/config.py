@@ -1,6 +1,6 @@
 """Configuration management."""
 
-import tomli
+import tomllib
 from pathlib import Path
 from dataclasses import dataclass
 
@@ -24,7 +24,7 @@ class SynologyConfig:
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
         with open(config_path, "rb") as f:
-            data = tomli.load(f)
+            data = tomllib.load(f)
 
         nas_config = data.get("nas", {})
         use_ssl = nas_config.get("use_ssl", True)
@@ -1,32 +1,50 @@
 """iSCSI management and safety checks."""
 
+import json
+import time
 from typing import Any
 from .api import SynologyAPI
 
+# Seconds for which check_active_connections reuses its own last fetch
+CONNECTIONS_TTL = 5
+
 
 class ISCSIManager:
     """Manages iSCSI targets and LUNs."""
 
     def __init__(self, api: SynologyAPI):
         self.api = api
+        self._targets_cache: list[dict[str, Any]] | None = None
+        self._targets_ts = 0.0
 
-    def get_all_targets(self) -> list[dict[str, Any]]:
+    def get_all_targets(self, include_connections: bool = False) -> list[dict[str, Any]]:
         """Get all iSCSI targets."""
-        return self.api.get_iscsi_targets()
+        return self.api.get_iscsi_targets(include_connections=include_connections)
 
     def get_all_luns(self) -> list[dict[str, Any]]:
         """Get all iSCSI LUNs."""
         return self.api.get_iscsi_luns()
 
-    def check_active_connections(self) -> tuple[bool, list[dict[str, Any]]]:
+    def check_active_connections(
+        self, targets: list[dict[str, Any]] | None = None
+    ) -> tuple[bool, list[dict[str, Any]]]:
         """
         Check if there are any active iSCSI connections.
 
+        Args:
+            targets: Targets previously fetched with include_connections=True;
+                fetched from the NAS if omitted, reusing a fetch made by this
+                method within the last CONNECTIONS_TTL seconds
+
         Returns:
             Tuple of (has_connections, list of connections)
         """
-        # Get all targets with connection information
-        targets = self.api.get_iscsi_targets(include_connections=True)
+        if targets is None:
+            if self._targets_cache is None or time.monotonic() - self._targets_ts >= CONNECTIONS_TTL:
+                # Get all targets with connection information
+                self._targets_cache = self.get_all_targets(include_connections=True)
+                self._targets_ts = time.monotonic()
+            targets = self._targets_cache
         all_connections = []
 
         for target in targets:
@@ -44,18 +62,24 @@ class ISCSIManager:
 
         return len(all_connections) > 0, all_connections
 
-    def get_luns_with_uuids(self) -> list[dict[str, Any]]:
-        """Get all LUNs with their UUIDs and metadata."""
-        luns = self.get_all_luns()
-        lun_list = []
-
-        for lun in luns:
-            lun_uuid = lun.get("uuid")
-            if lun_uuid:
-                lun_list.append({
-                    "uuid": lun_uuid,
-                    "name": lun.get("name", "Unknown"),
-                    "location": lun.get("location", ""),
-                })
-
-        return lun_list
\ No newline at end of file
+    def get_luns_with_uuids(self, luns: list[dict[str, Any]] | None = None) -> list[dict[str, Any]]:
+        """
+        Get all LUNs with their UUIDs and metadata.
+
+        Args:
+            luns: Previously fetched LUN list; fetched from the NAS if omitted
+        """
+        if luns is None:
+            luns = self.get_all_luns()
+
+        return [
+            {
+                "uuid": lun["uuid"],
+                # The DSM API expects LUN UUIDs JSON-encoded; encode once here
+                "uuid_json": json.dumps(lun["uuid"]),
+                "name": lun.get("name", "Unknown"),
+                "location": lun.get("location", ""),
+            }
+            for lun in luns
+            if lun.get("uuid")
+        ]
\ No newline at end of file
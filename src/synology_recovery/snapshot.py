@@ -1,8 +1,12 @@
 """Snapshot management and recovery operations."""
 
+import operator
 from typing import Any
-from datetime import datetime
-from .api import SynologyAPI
+from concurrent.futures import ThreadPoolExecutor
+from .api import MAX_CONNECTIONS, SynologyAPI
+
+# Possible snapshot creation timestamp field names, in order of preference
+_TS_FIELDS = ("time_create", "taken_time", "create_time")
 
 
 class SnapshotManager:
@@ -11,60 +15,109 @@ class SnapshotManager:
     def __init__(self, api: SynologyAPI):
         self.api = api
 
-    def get_snapshots_for_lun(self, lun_uuid: str) -> list[dict[str, Any]]:
+    def get_snapshots_for_lun(self, lun_uuid_json: str, limit: int | None = None) -> list[dict[str, Any]]:
         """
-        Get all snapshots for a given LUN UUID.
+        Get snapshots for a given JSON-encoded LUN UUID.
+
+        Args:
+            lun_uuid_json: JSON-encoded LUN UUID
+            limit: Only return this many of the newest snapshots, or None for all
 
         Returns snapshots sorted by creation time (newest first).
         """
-        snapshots = self.api.get_lun_snapshots(lun_uuid)
+        # DSM's list order is not documented, so always fetch the full list
+        # and pick the newest ones locally
+        snapshots = self.api.get_lun_snapshots(lun_uuid_json)
+        return self._sort_snapshots(snapshots, limit)
+
+    @staticmethod
+    def _sort_snapshots(snapshots: list[dict[str, Any]], limit: int | None = None) -> list[dict[str, Any]]:
+        """Annotate snapshots with their creation timestamp and sort newest first.
 
+        If limit is given, only that many of the newest snapshots are returned.
+        """
         for snapshot in snapshots:
-            # Try different possible timestamp field names
-            time_created = snapshot.get("time_create") or snapshot.get("taken_time") or snapshot.get("create_time")
-            if time_created:
-                snapshot["datetime"] = datetime.fromtimestamp(int(time_created))
-                snapshot["sort_time"] = int(time_created)
-            else:
-                snapshot["sort_time"] = 0
-
-        snapshots.sort(key=lambda s: s.get("sort_time", 0), reverse=True)
-        return snapshots
-
-    def get_most_recent_snapshot(self, lun_uuid: str) -> dict[str, Any] | None:
-        """Get the most recent snapshot for a LUN."""
-        snapshots = self.get_snapshots_for_lun(lun_uuid)
+            # Only the integer timestamp is stored; formatting is left to display
+            time_created = next((snapshot[k] for k in _TS_FIELDS if snapshot.get(k)), 0)
+            snapshot["sort_time"] = int(time_created)
+
+        if limit == 1 and snapshots:
+            # Only the newest is needed, no full sort required
+            return [max(snapshots, key=operator.itemgetter("sort_time"))]
+
+        snapshots.sort(key=operator.itemgetter("sort_time"), reverse=True)
+        return snapshots if limit is None else snapshots[:limit]
+
+    def get_most_recent_snapshot(self, lun_uuid_json: str) -> dict[str, Any] | None:
+        """Get the most recent snapshot for a JSON-encoded LUN UUID."""
+        snapshots = self.get_snapshots_for_lun(lun_uuid_json, limit=1)
         return snapshots[0] if snapshots else None
 
-    def revert_to_snapshot(self, lun_uuid: str, snapshot_uuid: str) -> None:
-        """Revert a LUN to a specific snapshot."""
-        self.api.revert_lun_snapshot(lun_uuid, snapshot_uuid)
+    def revert_to_snapshot(self, lun_uuid_json: str, snapshot_uuid: str) -> None:
+        """Revert a LUN, given its JSON-encoded UUID, to a specific snapshot."""
+        self.api.revert_lun_snapshot(lun_uuid_json, snapshot_uuid)
+
+    def _fetch_snapshots_concurrently(
+        self, luns: list[dict[str, Any]]
+    ) -> list[list[dict[str, Any]] | Exception]:
+        """Fetch snapshots for each LUN with one request per LUN, in parallel."""
+        def fetch(lun: dict[str, Any]) -> list[dict[str, Any]] | Exception:
+            try:
+                return self.get_snapshots_for_lun(lun["uuid_json"])
+            except Exception as e:
+                return e
+
+        if len(luns) <= 1:
+            return [fetch(lun) for lun in luns]
+
+        # Each lookup is a blocking HTTPS round trip, so issue them concurrently.
+        # Stay within the session's connection pool so every worker reuses a
+        # pooled connection instead of opening and discarding extra ones.
+        with ThreadPoolExecutor(max_workers=min(MAX_CONNECTIONS, len(luns))) as executor:
+            return list(executor.map(fetch, luns))
 
     def get_all_lun_snapshots(self, luns: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
         """
         Get snapshots for all LUNs.
 
         Args:
-            luns: List of LUN dictionaries with 'uuid' and 'name' keys
+            luns: List of LUN dictionaries with 'uuid', 'uuid_json' and 'name' keys
 
         Returns:
             Dictionary mapping LUN name to list of snapshots
         """
         all_snapshots = {}
 
-        for lun in luns:
-            lun_uuid = lun.get("uuid")
+        try:
+            # One compound request covers every LUN in a single round trip
+            results = self.api.get_lun_snapshots_batch([lun["uuid_json"] for lun in luns])
+            results = [
+                r if isinstance(r, Exception) else self._sort_snapshots(r)
+                for r in results
+            ]
+        except Exception:
+            # Fall back to individual requests if the NAS rejects compound calls
+            results = self._fetch_snapshots_concurrently(luns)
+        else:
+            # The envelope can succeed while sub-calls fail; retry those LUNs
+            # individually rather than reporting them as having no snapshots
+            failed = [i for i, r in enumerate(results) if isinstance(r, Exception)]
+            if failed:
+                retried = self._fetch_snapshots_concurrently([luns[i] for i in failed])
+                for i, snapshots in zip(failed, retried):
+                    results[i] = snapshots
+
+        for lun, snapshots in zip(luns, results):
             lun_name = lun.get("name", "Unknown")
-            try:
-                snapshots = self.get_snapshots_for_lun(lun_uuid)
-                if snapshots:
-                    # Store snapshots with LUN metadata for display
-                    all_snapshots[lun_name] = {
-                        "uuid": lun_uuid,
-                        "location": lun.get("location", ""),
-                        "snapshots": snapshots
-                    }
-            except Exception as e:
-                print(f"Warning: Could not get snapshots for {lun_name}: {e}")
+            if isinstance(snapshots, Exception):
+                print(f"Warning: Could not get snapshots for {lun_name}: {snapshots}")
+            elif snapshots:
+                # Store snapshots with LUN metadata for display
+                all_snapshots[lun_name] = {
+                    "uuid": lun.get("uuid"),
+                    "uuid_json": lun["uuid_json"],
+                    "location": lun.get("location", ""),
+                    "snapshots": snapshots
+                }
 
         return all_snapshots
\ No newline at end of file